@@ -1,18 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from urllib.parse import urlparse, urljoin
+import argparse
+import asyncio
 import concurrent.futures
-import time
-import random
-import json
+import os
+import httpx
+import hishel
+import anysqlite
+from aiolimiter import AsyncLimiter
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from urllib.parse import urljoin
+import orjson
 import re
+import html
+import itertools
+from lxml import etree
 # Configuration
 SITEMAP_URL = "https://www.duramotion.nl/sitemap.xml"
 BASE_URL = "https://www.duramotion.nl"
-MAX_WORKERS = 5
+MAX_CONCURRENCY = 20 # Max in-flight product scrapes
+MAX_RATE = 10 # Max requests per second (token bucket shared by all requests)
+POOL_SIZE = 50 # Connection pool size, kept above MAX_CONCURRENCY
+MAX_RETRIES = 3 # Retries for transport errors and 5xx responses
+RETRY_BACKOFF = 0.3 # Seconds; doubles after each retry
+RETRY_STATUSES = frozenset([500, 502, 503, 504])
+CACHE_FILE = "duramotion_cache.sqlite" # On-disk HTTP cache, makes reruns near-free
+CACHE_TTL = 86400 # Seconds before a cached page is fetched again
 MAX_URLS = 10000 # Limit as per requirement
-OUTPUT_FILE = "Duramotion_Full_Catalog.xlsx"
+OUTPUT_FILE = "Duramotion_Full_Catalog.parquet"
+EXCEL_FILE = "Duramotion_Full_Catalog.xlsx" # Only written with --excel
+WRITE_BATCH_SIZE = 500 # Records buffered before each Parquet row group is written
 # Headers for Session
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -20,7 +38,7 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9,nl;q=0.8",
 }
 # Known non-product paths (blacklist) to skip during harvesting
-BLACKLIST = [
+BLACKLIST = frozenset([
     'contact', 'sitemap', 'nieuws', 'reviews', 'cookies', 'assortiment', 
     'categorieen', 'faq', 'vacatures', 'blog', 'team', 'partners', 
     'omvormen', 'kennis-partner', 'technische-support', 'klantportaal', 
@@ -29,207 +47,393 @@ BLACKLIST = [
     'nieuwsbrief-inschrijving', 'huawei', 'eaton', 'cimco', 'omvormers', 
     'elektra', 'kabels', 'klein-materiaal', 'onderconstructie', 
     'calculators', 'chint', 'sas-box', 'cah-caw'
-]
-def fetch_sitemap_urls(session):
+])
+# Parse only the elements we actually read (everything else is skipped by the parser)
+EN_LINK_STRAINER = SoupStrainer('link', attrs={'hreflang': 'en'})
+PRODUCT_TAGS = ('h1', 'div', 'a', 'script')
+PRODUCT_STRAINER = SoupStrainer(list(PRODUCT_TAGS))
+# Output columns (every value is a string; missing values are "N/A")
+CATALOG_SCHEMA = pa.schema([
+    ("Product Code", pa.string()),
+    ("Title", pa.string()),
+    ("Description", pa.string()),
+    ("Image Link", pa.string()),
+    ("PDF Link", pa.string()),
+    ("Source URL", pa.string()),
+])
+# Fast path for the English alternate link (matched on raw bytes, no parse).
+# Accepts what EN_LINK_STRAINER accepts: tag/attribute names in any case, but the value
+# must be exactly "en". Commented-out markup is not handled (a <link> inside <!-- -->
+# would match here but not in BeautifulSoup).
+EN_LINK_RE = re.compile(rb'<(?i:link)\s(?:[^>]*?\s)?(?i:hreflang)=["\']en["\'][^>]*?\s(?i:href)=["\']([^"\']+)["\']')
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Paces requests through the shared rate limiter. Sits below the cache, so cache hits skip it."""
+    def __init__(self, transport, limiter):
+        self._transport = transport
+        self._limiter = limiter
+    async def handle_async_request(self, request):
+        async with self._limiter:
+            return await self._transport.handle_async_request(request)
+    async def aclose(self):
+        await self._transport.aclose()
+class CatalogWriter:
+    """Streams product records to a Parquet file in batches of WRITE_BATCH_SIZE.
+    The file is only created once the first batch is written."""
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._batch = []
+        self._writer = None
+    def write(self, record):
+        self._batch.append(record)
+        self.count += 1
+        if len(self._batch) >= WRITE_BATCH_SIZE:
+            self.flush()
+    def flush(self):
+        if not self._batch:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, CATALOG_SCHEMA, compression='zstd')
+        self._writer.write_table(pa.Table.from_pylist(self._batch, schema=CATALOG_SCHEMA))
+        self._batch = []
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+async def fetch(client, url, method='GET'):
+    """Requests a URL, retrying 5xx responses and transport errors (timeouts, dropped
+    connections, HTTP/2 GOAWAY) with backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.request(method, url)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+async def iter_sitemap_locs(client):
+    """Streams the sitemap and yields each <loc> URL as soon as it is parsed."""
+    # recover=True skips past malformed markup (e.g. an unescaped & in a <loc>) instead of
+    # aborting the whole sitemap. After such an error lxml only hands out the remaining
+    # events on close(), so a broken sitemap is buffered rather than streamed.
+    parser = etree.XMLPullParser(events=('start', 'end'), recover=True)
+    root = None
+    depth = 0
+    def read_locs():
+        nonlocal root, depth
+        locs = []
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if elem.tag == 'loc' or elem.tag.endswith('}loc'):
+                locs.append((elem.text or '').strip())
+            # Detach each finished <url> from <urlset> so memory stays flat
+            if depth == 1:
+                root.remove(elem)
+        return locs
+    async with client.stream('GET', SITEMAP_URL) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+            for url in read_locs():
+                yield url
+    parser.close()
+    for url in read_locs():
+        yield url
+async def fetch_sitemap_urls(client):
     """Fetches sitemap and returns a list of POTENTIAL product URLs (Dutch)."""
     print(f"Fetching sitemap from {SITEMAP_URL}...")
     try:
-        response = session.get(SITEMAP_URL)
-        response.raise_for_status()
-        # Use html.parser instead of xml to avoid lxml dependency issues
-        soup = BeautifulSoup(response.content, 'html.parser')
-        locs = soup.find_all('loc')
-        print(f"DEBUG: Found {len(locs)} <loc> tags.")
-        urls = [loc.text for loc in locs]
-        
         # Filter: 
         # 1. Must contain '/nl/' (since sitemap is dutch only)
         # 2. Must NOT be in the blacklist (substring check on path segments)
         # 3. Path depth >= 2 (e.g. /nl/product-name)
         
-        valid_urls = []
-        for url in urls:
-            if '/nl/' in url:
-                path = urlparse(url).path.strip('/')
-                parts = [p for p in path.split('/') if p] # e.g. ['nl', 'product-name']
-                
-                # Check depth
-                if len(parts) < 2:
-                    continue
-                
-                # Check blacklist
-                # If the last segment is in blacklist, skip.
-                # If the first segment after 'nl' is in blacklist (e.g. /nl/blog/post), skip.
-                slug = parts[-1].lower()
-                segment_after_lang = parts[1].lower() if len(parts) > 1 else ""
-                if slug in BLACKLIST or segment_after_lang in BLACKLIST:
-                    # print(f"Skipping Blacklisted: {slug} / {segment_after_lang}")
-                    continue
-                
-                # Heuristic: Skip if looks like paginated list or special query (though sitemap usually static)
-                valid_urls.append(url)
+        valid_urls = set() # Deduplicated as we go
+        raw_count = 0
+        sample_urls = [] # First few raw URLs, printed if nothing passes the filter
+        async for url in iter_sitemap_locs(client):
+            raw_count += 1
+            if len(sample_urls) < 5:
+                sample_urls.append(url)
+            if '/nl/' not in url:
+                continue
+            path = url.split('/nl/', 1)[1].strip('/').lower()
+            
+            # Check depth (something must follow /nl/)
+            if not path:
+                continue
+            
+            # Check blacklist
+            # If the last segment is in blacklist, skip.
+            # If the first segment after 'nl' is in blacklist (e.g. /nl/blog/post), skip.
+            parts = path.split('/') # e.g. ['blog', 'post']
+            if parts[-1] in BLACKLIST or parts[0] in BLACKLIST:
+                # print(f"Skipping Blacklisted: {parts[-1]} / {parts[0]}")
+                continue
+            
+            # Heuristic: Skip if looks like paginated list or special query (though sitemap usually static)
+            valid_urls.add(url)
         
-        # Deduplicate and Limit
-        unique_urls = list(set(valid_urls))
-        print(f"Total raw URLs: {len(urls)}")
-        print(f"Total valid URLs: {len(unique_urls)}")
-        if len(unique_urls) == 0:
+        print(f"DEBUG: Found {raw_count} <loc> tags.")
+        print(f"Total raw URLs: {raw_count}")
+        print(f"Total valid URLs: {len(valid_urls)}")
+        if len(valid_urls) == 0:
             print("DEBUG: Sample URLs from sitemap:")
-            for u in urls[:5]:
+            for u in sample_urls:
                 print(f" - {u}")
                 
-        print(f"Found {len(unique_urls)} potential product URLs (Dutch). Processing first {MAX_URLS}...")
-        return unique_urls[:MAX_URLS]
+        print(f"Found {len(valid_urls)} potential product URLs (Dutch). Processing first {MAX_URLS}...")
+        # Limit
+        return list(itertools.islice(valid_urls, MAX_URLS))
     except Exception as e:
         print(f"Error fetching sitemap: {e}")
         return []
-def extract_product_data(session, dutch_url):
-    """Extracts data: Fetches Dutch page -> Finds English Link -> Scrapes English Page."""
-    # time.sleep(random.uniform(1, 2))  # Rate limiting
+async def resolve_english_url(client, dutch_url):
+    """Finds the page to scrape for a Dutch URL.
+    Returns the English URL, or the Dutch URL itself if there is no English version.
+    Returns None if the Dutch page fails (bad status or request error), in which case
+    the product is skipped. Costs 1 HEAD when the /en/ guess hits, otherwise 1 HEAD +
+    1 GET of the Dutch page (re-read from the disk cache if it is scraped in Dutch)."""
     try:
-        # 1. Fetch Dutch Page
+        # 1. Guess: same slug under /en/, confirmed with a HEAD (no body, no parse).
+        # It is only a guess, so a failed HEAD just falls through to the Dutch page.
+        guessed_url = dutch_url.replace('/nl/', '/en/', 1)
+        try:
+            r_head = await fetch(client, guessed_url, method='HEAD')
+            if r_head.status_code == 200 and not r_head.history:
+                return guessed_url
+        except httpx.HTTPError:
+            pass
+        
+        # 2. Fetch Dutch Page
         # print(f"DEBUG: Processing {dutch_url}")
-        r_nl = session.get(dutch_url, timeout=10)
+        r_nl = await fetch(client, dutch_url)
         if r_nl.status_code != 200:
             print(f"DEBUG: Failed to fetch Dutch URL {dutch_url} ({r_nl.status_code})")
             return None
+        html_nl = r_nl.content
         
-        soup_nl = BeautifulSoup(r_nl.text, 'html.parser')
-        
-        # 2. Find English URL
-        target_soup = soup_nl
-        target_url = dutch_url
-        
+        # 3. Find English URL (regex first, only parse the Dutch page if it misses)
+        match = EN_LINK_RE.search(html_nl)
+        if match:
+            try:
+                return html.unescape(match.group(1).decode())
+            except UnicodeDecodeError:
+                pass # Not UTF-8, let BeautifulSoup detect the page encoding below
+        soup_nl = BeautifulSoup(html_nl, 'lxml', parse_only=EN_LINK_STRAINER)
         en_link_tag = soup_nl.find('link', attrs={'hreflang': 'en'})
         if en_link_tag and en_link_tag.get('href'):
-            english_url = en_link_tag.get('href')
-            # print(f"DEBUG: Found English URL: {english_url}")
-            
-            # 3. Fetch English Page
-            time.sleep(random.uniform(0.5, 1.5))
-            r_en = session.get(english_url, timeout=10)
-            if r_en.status_code == 200:
-                target_soup = BeautifulSoup(r_en.text, 'html.parser')
-                target_url = english_url
+            return en_link_tag.get('href')
+        # print(f"DEBUG: No English link found for {dutch_url}, scraping Dutch")
+        return dutch_url
+    except Exception as e:
+        print(f"Error resolving English URL for {dutch_url}: {e}")
+        return None
+def parse_product_html(html_bytes, url):
+    """Extracts the product record from a page. Runs in a worker process, so it must stay top-level and picklable."""
+    soup = BeautifulSoup(html_bytes, 'lxml', parse_only=PRODUCT_STRAINER)
+    
+    # Extract Data (Standard Logic)
+    
+    # Single pass over the (strained) tree, keeping the first match of each element
+    title_tag = code_div = desc_div = img_tag = pdf_tag = pdf_icon = None
+    scripts = []
+    for el in soup.descendants:
+        if not isinstance(el, Tag):
+            continue
+        name = el.name
+        classes = el.get('class') or ()
+        if name == 'h1':
+            if title_tag is None:
+                title_tag = el
+        elif name == 'div':
+            if code_div is None and 'zl_product_list_code' in classes:
+                code_div = el
+            if desc_div is None and el.get('id') == 'omschrijving':
+                desc_div = el
+        elif name == 'a':
+            if img_tag is None and 'productImage' in (el.get('rel') or ()):
+                img_tag = el
+            if pdf_tag is None and 'fa-file-pdf' in classes:
+                pdf_tag = el
+        elif name == 'script':
+            if el.get('type') == 'application/ld+json':
+                scripts.append(el)
+        if pdf_icon is None and 'fa-file-pdf' in classes:
+            pdf_icon = el
+    
+    # Title
+    title = title_tag.get_text(strip=True) if title_tag else "N/A"
+    
+    # Product Code
+    code = "N/A"
+    if code_div:
+         code = code_div.get_text(strip=True)
+    if code == "N/A":
+        # Only reached when the HTML selector missed; stop at the first mpn/sku
+        for script in scripts:
+            try:
+                # Hand orjson the raw UTF-8 bytes (script contents are never entity-escaped)
+                data = orjson.loads(script.encode_contents())
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(data, list): data = data[0] if data else {}
+            if not isinstance(data, dict):
+                continue
+            if 'mpn' in data:
+                value = data['mpn']
+            elif 'sku' in data:
+                value = data['sku']
             else:
-                print(f"DEBUG: Failed to fetch English URL {english_url}, using Dutch")
-        else:
-            # print(f"DEBUG: No English link found for {dutch_url}, scraping Dutch")
-            pass
-            
-        soup = target_soup
-        
-        # 4. Extract Data (Standard Logic)
-        
-        # Title
-        title_tag = soup.find('h1')
-        title = title_tag.get_text(strip=True) if title_tag else "N/A"
-        
-        # Product Code
-        code = "N/A"
-        code_div = soup.find('div', class_='zl_product_list_code')
-        if code_div:
-             code = code_div.get_text(strip=True)
-        if code == "N/A":
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-                    if isinstance(data, list): data = data[0]
-                    if 'mpn' in data:
-                        code = data['mpn']
-                        break
-                    elif 'sku' in data:
-                         code = data['sku']
-                         break
-                except: continue
+                continue
+            # Keep the column all-string; null/empty codes count as missing
+            code = str(value) if value not in (None, '') else "N/A"
+            break
+    
+    # Description
+    description = desc_div.get_text(separator='\n', strip=True) if desc_div else "N/A"
+    
+    # Image Link
+    image_link = urljoin(BASE_URL, img_tag.get('href')) if img_tag and img_tag.get('href') else "N/A"
         
-        # Description
-        desc_div = soup.find('div', id='omschrijving')
-        description = desc_div.get_text(separator='\n', strip=True) if desc_div else "N/A"
+    # PDF Link
+    pdf_link = "N/A"
+    if pdf_tag and pdf_tag.get('href'):
+         pdf_link = urljoin(BASE_URL, pdf_tag.get('href'))
+    elif pdf_icon:
+        parent_a = pdf_icon.find_parent('a')
+        if parent_a and parent_a.get('href'):
+             pdf_link = urljoin(BASE_URL, parent_a.get('href'))
+    return {
+        "Product Code": code,
+        "Title": title,
+        "Description": description,
+        "Image Link": image_link,
+        "PDF Link": pdf_link,
+        "Source URL": url
+    }
+async def extract_product_data(client, pool, dutch_url, target_url):
+    """Extracts data: Scrapes the resolved (English) page, falling back to the Dutch page."""
+    try:
+        # 1. Fetch English Page
+        response = await fetch(client, target_url)
+        if response.status_code != 200 and target_url != dutch_url:
+            print(f"DEBUG: Failed to fetch English URL {target_url}, using Dutch")
+            target_url = dutch_url
+            response = await fetch(client, dutch_url)
+        if response.status_code != 200:
+            print(f"DEBUG: Failed to fetch Dutch URL {dutch_url} ({response.status_code})")
+            return None
         
-        # Image Link
-        img_tag = soup.find('a', attrs={'rel': 'productImage'})
-        image_link = urljoin(BASE_URL, img_tag.get('href')) if img_tag and img_tag.get('href') else "N/A"
-            
-        # PDF Link
-        pdf_link = "N/A"
-        pdf_tag = soup.select_one('a.fa-file-pdf')
-        if pdf_tag and pdf_tag.get('href'):
-             pdf_link = urljoin(BASE_URL, pdf_tag.get('href'))
-        else:
-            pdf_icon = soup.select_one('.fa-file-pdf')
-            if pdf_icon:
-                parent_a = pdf_icon.find_parent('a')
-                if parent_a and parent_a.get('href'):
-                     pdf_link = urljoin(BASE_URL, parent_a.get('href'))
-        return {
-            "Product Code": code,
-            "Title": title,
-            "Description": description,
-            "Image Link": image_link,
-            "PDF Link": pdf_link,
-            "Source URL": target_url
-        }
+        # 2. Parse + extract in the process pool while the event loop keeps downloading
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, parse_product_html, response.content, target_url)
     except Exception as e:
         print(f"Error scraping {dutch_url} -> English: {e}")
         return None
-def main():
-    session = requests.Session()
-    session.headers.update(HEADERS)
+async def gather_bounded(worker, items, label):
+    """Runs worker(item) for all items concurrently (bounded by MAX_CONCURRENCY) and returns the results in order."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    completed = 0
+    async def run(item):
+        nonlocal completed
+        async with semaphore:
+            result = await worker(item)
+        completed += 1
+        if completed % 10 == 0:
+            print(f"{label}: {completed}/{len(items)}")
+        return result
+    return await asyncio.gather(*[run(item) for item in items])
+async def resolve_all(client, dutch_urls):
+    """Builds the Dutch -> English URL map (URLs only), leaving out Dutch pages that could not be fetched."""
+    async def resolve(url):
+        return await resolve_english_url(client, url)
+    resolved = await gather_bounded(resolve, dutch_urls, "Resolving")
+    return {dutch: target for dutch, target in zip(dutch_urls, resolved) if target}
+async def extract_all(client, pool, dutch_to_en, writer):
+    """Scrapes all resolved pages, handing each record to the writer as soon as it is extracted."""
+    async def extract(item):
+        data = await extract_product_data(client, pool, *item)
+        if data:
+            writer.write(data)
+    await gather_bounded(extract, list(dutch_to_en.items()), "Progress")
+async def scrape():
+    # HTTP/2 multiplexes the concurrent requests to duramotion.nl over one TLS connection;
+    # the transport also retries failed connection attempts
+    limits = httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+    limiter = AsyncLimiter(max_rate=MAX_RATE, time_period=1.0)
     
     # Phase 1: Harvest Dutch URLs
-    dutch_urls = fetch_sitemap_urls(session)
+    # The sitemap bypasses the cache: hishel reads every body in full before returning it,
+    # which would hand iter_sitemap_locs the whole document as a single chunk
+    transport = RateLimitedTransport(httpx.AsyncHTTPTransport(http2=True, retries=MAX_RETRIES), limiter)
+    async with httpx.AsyncClient(transport=transport, headers=HEADERS, timeout=10.0, follow_redirects=True) as client:
+        dutch_urls = await fetch_sitemap_urls(client)
     if not dutch_urls:
         print("No URLs found. Exiting.")
-        return
-    print(f"Starting extraction for {len(dutch_urls)} items (Dutch -> English)...")
-    results = []
+        return None
     
-    # Phase 2: Extract
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_url = {executor.submit(extract_product_data, session, url): url for url in dutch_urls}
-        completed = 0
-        for future in concurrent.futures.as_completed(future_to_url):
-            data = future.result()
-            if data:
-                results.append(data)
-            completed += 1
-            if completed % 10 == 0:
-                print(f"Progress: {completed}/{len(dutch_urls)}")
-    # Phase 3: Export
-    if not results:
+    # Product pages: cache successful GET/HEAD responses on disk for CACHE_TTL, regardless
+    # of the site's cache headers
+    storage = hishel.AsyncSQLiteStorage(connection=await anysqlite.connect(CACHE_FILE), ttl=CACHE_TTL)
+    # The storage owns the SQLite connection; close it even if setup or the scrape fails
+    # (closing the client also closes it, and a second close is a no-op)
+    try:
+        controller = hishel.Controller(cacheable_methods=['GET', 'HEAD'], cacheable_status_codes=[200], force_cache=True)
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=MAX_RETRIES)
+        transport = hishel.AsyncCacheTransport(transport=RateLimitedTransport(transport, limiter), storage=storage, controller=controller)
+        async with httpx.AsyncClient(transport=transport, headers=HEADERS, timeout=10.0, follow_redirects=True) as client:
+            # Phase 2: Map Dutch -> English URLs
+            print(f"Resolving English URLs for {len(dutch_urls)} items...")
+            dutch_to_en = await resolve_all(client, dutch_urls)
+            print(f"Starting extraction for {len(dutch_to_en)} items (Dutch -> English)...")
+        
+            # Phase 3: Extract + Export (downloads stay in the event loop, parsing runs on all cores,
+            # records are streamed to Parquet as they complete)
+            writer = CatalogWriter(OUTPUT_FILE)
+            try:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                    await extract_all(client, pool, dutch_to_en, writer)
+            finally:
+                writer.close()
+            return writer.count
+    finally:
+        await storage.aclose()
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the duramotion.nl product catalog.")
+    parser.add_argument('--excel', action='store_true', help=f"also write {EXCEL_FILE} (slower than the Parquet output)")
+    args = parser.parse_args()
+    
+    count = asyncio.run(scrape())
+    if count is None:
+        return
+    if not count:
         print("No results extracted. Check if English versions exist.")
         return
-    print(f"Exporting {len(results)} items to Excel...")
-    df = pd.DataFrame(results)
-    
-    # Create Excel writer
-    writer = pd.ExcelWriter(OUTPUT_FILE, engine='xlsxwriter')
-    df.to_excel(writer, index=False, sheet_name='Catalog')
-    
-    workbook = writer.book
-    worksheet = writer.sheets['Catalog']
+    print(f"Done! Saved {count} items to {OUTPUT_FILE}")
     
-    # Formats
-    link_format = workbook.add_format({'font_color': 'blue', 'underline': 1})
-    
-    img_col_idx = df.columns.get_loc("Image Link")
-    pdf_col_idx = df.columns.get_loc("PDF Link")
-    
-    for row_num, (img_link, pdf_link) in enumerate(zip(df['Image Link'], df['PDF Link'])):
-        excel_row = row_num + 1
-        
-        if img_link != "N/A":
-            worksheet.write_url(excel_row, img_col_idx, img_link, link_format, string=img_link)
-        else:
-            worksheet.write_string(excel_row, img_col_idx, "N/A")
-            
-        if pdf_link != "N/A":
-            worksheet.write_url(excel_row, pdf_col_idx, pdf_link, link_format, string=pdf_link)
-        else:
-             worksheet.write_string(excel_row, pdf_col_idx, "N/A")
-    writer.close()
-    print(f"Done! Saved to {OUTPUT_FILE}")
+    # Phase 4: Optional Excel export (reads the finished Parquet file back)
+    if args.excel:
+        print(f"Exporting {count} items to Excel...")
+        df = pd.read_parquet(OUTPUT_FILE)
+        # Create Excel writer
+        # Everything is written as plain text in one to_excel pass; then only the Image/PDF
+        # link cells are overwritten as blue clickable hyperlinks ("N/A" stays plain text)
+        with pd.ExcelWriter(EXCEL_FILE, engine='xlsxwriter', engine_kwargs={'options': {'strings_to_urls': False}}) as writer:
+            df.to_excel(writer, index=False, sheet_name='Catalog')
+            worksheet = writer.sheets['Catalog']
+            for column in ("Image Link", "PDF Link"):
+                col_idx = df.columns.get_loc(column)
+                for row_num, link in enumerate(df[column], start=1):
+                    if link != "N/A":
+                        worksheet.write_url(row_num, col_idx, link, string=link)
+        print(f"Done! Saved to {EXCEL_FILE}")
 if __name__ == "__main__":
     main()
\ No newline at end of file